@@ -0,0 +1,57 @@
+"""
+Synthetic data generators used by the benchmarks.
+"""
+import contextlib
+import io
+
+from stfwriter import STFWriter
+
+
+def make_template_payload(screen_count, options_per_screen=3, stf_mode=False):
+    """
+    Build a dictionary shaped like TemplateSchema with the given number of
+    screens. Each screen links forward to the next ones so option targets
+    are always valid.
+    """
+    screens = []
+    for i in range(1, screen_count + 1):
+        screens.append({
+            "id": i,
+            "id_name": f"screen_{i}",
+            "custom_dialog_text": f"This is the dialog text shown on screen {i}.",
+            "leftDialog": f"@conversation/bench:s_{i}" if stf_mode else None,
+            "stop_conversation": i == screen_count,
+            "options": [
+                {
+                    "id": (i - 1) * options_per_screen + j + 1,
+                    "text": f"Option {j + 1} on screen {i}",
+                    "stfReference": f"@conversation/bench:s_{i}_{j}" if stf_mode else None,
+                    "next_screen": (i + j) % screen_count + 1,
+                } for j in range(options_per_screen)
+            ],
+        })
+
+    return {
+        "id": 1,
+        "name": "bench",
+        "stf_mode": stf_mode,
+        "initial_screen": 1 if screen_count else None,
+        "screens": screens,
+    }
+
+
+def make_stf_rows(row_count):
+    """
+    Build STFWriter input: a list of [key, value] rows.
+    """
+    return [[f"s_{i}", f"String table value number {i}."] for i in range(row_count)]
+
+
+def make_stf_bytes(row_count):
+    """
+    Build the contents of an STF file with the given number of rows.
+    """
+    buffer = io.BytesIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        STFWriter().save_data(make_stf_rows(row_count), buffer)
+    return buffer.getvalue()
@@ -0,0 +1,128 @@
+"""
+Measurement and baseline helpers used by the benchmark management command.
+"""
+import contextlib
+import gc
+import json
+import time
+import tracemalloc
+
+from django.db import connection, transaction
+
+
+@contextlib.contextmanager
+def rollback():
+    """
+    Run the enclosed block in a transaction that is always rolled back, so
+    benchmarks never leave data behind in the database.
+    """
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def measure(func, setup=None, repeat=5, isolate=contextlib.nullcontext):
+    """
+    Measure func, returning best-of-repeat wall time, SQL query count and
+    peak traced memory. setup runs outside the measurement and its return
+    value is passed to func; both run inside isolate on every call.
+    """
+    def run(probe):
+        with isolate():
+            args = setup() if setup else ()
+            with probe() as result:
+                func(*args)
+        return result
+
+    # Warm up caches (query compilation, pydantic validators) before timing
+    run(_wall_time)
+    timings = [run(_wall_time)["ms"] for _ in range(repeat)]
+    return {
+        "wall_ms": round(min(timings), 3),
+        "queries": run(_query_count)["count"],
+        "peak_kib": round(run(_peak_memory)["kib"], 1),
+    }
+
+
+@contextlib.contextmanager
+def _wall_time():
+    # Like timeit, keep garbage collection pauses out of the timing
+    result = {}
+    gc.collect()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        yield result
+        result["ms"] = (time.perf_counter() - start) * 1000
+    finally:
+        gc.enable()
+
+
+@contextlib.contextmanager
+def _query_count():
+    # Count in an execute wrapper rather than through connection.queries,
+    # whose log is capped at 9000 entries
+    result = {"count": 0}
+
+    def count(execute, sql, params, many, context):
+        result["count"] += 1
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        yield result
+
+
+@contextlib.contextmanager
+def _peak_memory():
+    result = {}
+    tracemalloc.start()
+    try:
+        yield result
+        result["kib"] = tracemalloc.get_traced_memory()[1] / 1024
+    finally:
+        tracemalloc.stop()
+
+
+def merge_best(first, second):
+    """
+    Combine two measurements of the same benchmark, keeping the best of each.
+    """
+    return {metric: min(first[metric], second[metric]) for metric in first}
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=4, sort_keys=True)
+
+
+def compare_results(baseline, results, threshold, min_delta_ms=1.0):
+    """
+    Return a list of regressions of results against baseline.
+
+    Wall time and peak memory regress when they grow by more than threshold
+    (0.25 means 25%). Wall time must also grow by more than min_delta_ms,
+    so noise on sub-millisecond benchmarks doesn't fail the run. Query
+    counts are deterministic, so any increase counts. Benchmarks missing
+    from the baseline are ignored.
+    """
+    regressions = []
+    for name, current in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if (current["wall_ms"] > previous["wall_ms"] * (1 + threshold)
+                and current["wall_ms"] - previous["wall_ms"] > min_delta_ms):
+            regressions.append(
+                f"{name} wall_ms: {previous['wall_ms']} -> {current['wall_ms']}")
+        if current["peak_kib"] > previous["peak_kib"] * (1 + threshold):
+            regressions.append(
+                f"{name} peak_kib: {previous['peak_kib']} -> {current['peak_kib']}")
+        if current["queries"] > previous["queries"]:
+            regressions.append(
+                f"{name} queries: {previous['queries']} -> {current['queries']}")
+    return regressions
@@ -0,0 +1,90 @@
+"""
+Measure serialization time and bytes on the wire for a get_template response.
+
+Times the same steps ninja runs for the endpoint: validating and dumping the
+result through TemplateSchema, then rendering it with the API's renderer.
+
+Usage:
+    python -m benchmarks.payload --screens 2000
+"""
+import argparse
+import gzip
+import os
+import time
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'convo.settings')
+django.setup()
+
+from django.test import RequestFactory  # noqa: E402
+from ninja.renderers import JSONRenderer  # noqa: E402
+
+from benchmarks.generators import make_template_payload  # noqa: E402
+from convotemplates.api import TemplateSchema, api  # noqa: E402
+from convotemplates.middleware import CompressionMiddleware, brotli  # noqa: E402
+from convotemplates.renderers import orjson  # noqa: E402
+
+
+def _best_time(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _to_bytes(body):
+    return body.encode() if isinstance(body, str) else body
+
+
+def run(screen_count, options_per_screen, repeat):
+    payload = make_template_payload(screen_count, options_per_screen)
+    request = RequestFactory().get('/')
+    results = {"screens": screen_count, "options_per_screen": options_per_screen}
+
+    def validate():
+        return TemplateSchema.model_validate(payload).model_dump()
+
+    data = validate()
+    stdlib_renderer = JSONRenderer()
+
+    # Serialization time, split into the schema step and the renderer step
+    results["schema_ms"] = _best_time(validate, repeat) * 1000
+    results["render_stdlib_ms"] = _best_time(
+        lambda: stdlib_renderer.render(request, data, response_status=200),
+        repeat) * 1000
+    if orjson is not None:
+        results["render_orjson_ms"] = _best_time(
+            lambda: api.renderer.render(request, data, response_status=200),
+            repeat) * 1000
+
+    # Bytes on the wire for the body the API actually sends
+    body = _to_bytes(api.renderer.render(request, data, response_status=200))
+    results["stdlib_identity_bytes"] = len(_to_bytes(
+        stdlib_renderer.render(request, data, response_status=200)))
+    results["identity_bytes"] = len(body)
+    results["gzip_bytes"] = len(gzip.compress(body, compresslevel=6))
+    if brotli is not None:
+        results["brotli_bytes"] = len(brotli.compress(
+            body, quality=CompressionMiddleware.brotli_quality))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--screens', type=int, default=2000)
+    parser.add_argument('--options', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    for key, value in run(args.screens, args.options, args.repeat).items():
+        if isinstance(value, float):
+            value = f"{value:.2f}"
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == '__main__':
+    main()
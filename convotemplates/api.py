@@ -1,6 +1,7 @@
 from ninja import NinjaAPI, Schema
 from django.shortcuts import get_object_or_404
 from django.db import transaction
+from django.db.models import F
 from .models import ConvoTemplate, ConvoScreen, ConvoOption
 from typing import List, Optional
 import logging
@@ -8,8 +9,10 @@ from ninja.errors import HttpError
 from stfwriter import STFWriter
 from io import BytesIO
 from django.http import HttpResponse
+from django.utils.http import parse_etags
+from .renderers import ORJSONRenderer
 
-api = NinjaAPI()
+api = NinjaAPI(renderer=ORJSONRenderer())
 logger = logging.getLogger(__name__)
 
 # Schema definitions
@@ -121,7 +124,10 @@ def update_template(request, template_id: int, template: TemplateSchema):
             db_template = get_object_or_404(ConvoTemplate, id=template_id)
             db_template.name = template.name
             db_template.stf_mode = template.stf_mode
+            # Bump in the database so concurrent updates can't share a revision
+            db_template.revision = F('revision') + 1
             db_template.save()
+            db_template.refresh_from_db(fields=['revision'])
 
             # Remove existing screens and options
             db_template.screens.all().delete()
@@ -198,14 +204,45 @@ def list_templates(request):
 
 
 @api.get("/templates/{template_id}", response=TemplateSchema)
-def get_template(request, template_id: int):
+def get_template(request, template_id: int, response: HttpResponse):
     """
     Get a specific conversation template.
+
+    Responds with 304 Not Modified when the client's If-None-Match header
+    matches the template's current revision.
     """
     template = get_object_or_404(ConvoTemplate, id=template_id)
+    etag = _template_etag(template)
+    if _etag_matches(etag, request.headers.get('If-None-Match', '')):
+        not_modified = HttpResponse(status=304)
+        not_modified['ETag'] = etag
+        not_modified['Cache-Control'] = 'no-cache'
+        return not_modified
+
+    response['ETag'] = etag
+    response['Cache-Control'] = 'no-cache'
     return _template_to_schema(template)
 
 
+def _template_etag(template: ConvoTemplate) -> str:
+    """
+    Build a weak ETag from the template's id and revision.
+    """
+    return f'W/"{template.id}-{template.revision}"'
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Weakly compare an ETag against the value of an If-None-Match header.
+    """
+    if not if_none_match:
+        return False
+    candidates = parse_etags(if_none_match)
+    if '*' in candidates:
+        return True
+    return etag.removeprefix('W/') in (c.removeprefix('W/') for c in candidates)
+
+
 def _template_to_schema(template: ConvoTemplate, include_screens: bool = True) -> dict:
     """
     Convert a ConvoTemplate instance to a dictionary matching TemplateSchema.
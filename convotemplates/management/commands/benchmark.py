@@ -0,0 +1,170 @@
+import contextlib
+import io
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+import benchmarks
+from benchmarks.generators import make_stf_bytes, make_stf_rows, make_template_payload
+from benchmarks.harness import (compare_results, load_baseline, measure, merge_best, rollback,
+                                save_baseline)
+from stf_reader import STFReader
+from stfwriter import STFWriter
+
+from ...api import (TemplateSchema, _generate_lua_script, _template_to_schema,
+                    create_template, update_template)
+from ...models import ConvoTemplate
+
+DEFAULT_BASELINE = Path(benchmarks.__file__).parent / 'baseline.json'
+
+
+def _create(payload):
+    """
+    Store a template built from payload and return a fresh instance of it.
+
+    Goes through update_template because create_template doesn't store
+    stf_mode or the STF references.
+    """
+    template = ConvoTemplate.objects.create(name=payload["name"])
+    update_template(None, template.id, TemplateSchema(**payload))
+    return ConvoTemplate.objects.get(id=template.id)
+
+
+def _bench_stf_read(size, repeat):
+    data = make_stf_bytes(size)
+    return measure(lambda: STFReader().read_stf(data), repeat=repeat)
+
+
+def _bench_stf_write(size, repeat):
+    rows = make_stf_rows(size)
+
+    def write():
+        # save_data prints the row count, keep it out of the output
+        with contextlib.redirect_stdout(io.StringIO()):
+            STFWriter().save_data(rows, io.BytesIO())
+
+    return measure(write, repeat=repeat)
+
+
+def _bench_lua(size, repeat):
+    payload = make_template_payload(size, stf_mode=True)
+    return measure(_generate_lua_script, setup=lambda: (_create(payload),),
+                   repeat=repeat, isolate=rollback)
+
+
+def _bench_schema(size, repeat):
+    payload = make_template_payload(size, stf_mode=True)
+    return measure(_template_to_schema, setup=lambda: (_create(payload),),
+                   repeat=repeat, isolate=rollback)
+
+
+def _bench_create(size, repeat):
+    payload = make_template_payload(size, stf_mode=True)
+    return measure(lambda: create_template(None, TemplateSchema(**payload)),
+                   repeat=repeat, isolate=rollback)
+
+
+def _bench_update(size, repeat):
+    payload = make_template_payload(size, stf_mode=True)
+    return measure(
+        lambda template: update_template(
+            None, template.id, TemplateSchema(**payload)),
+        setup=lambda: (_create(payload),), repeat=repeat, isolate=rollback)
+
+
+BENCHMARKS = {
+    'stf_read': _bench_stf_read,
+    'stf_write': _bench_stf_write,
+    'lua': _bench_lua,
+    'schema': _bench_schema,
+    'create': _bench_create,
+    'update': _bench_update,
+}
+
+
+class Command(BaseCommand):
+    help = ("Benchmark the STF, Lua and template CRUD hot paths and compare "
+            "the results against a stored JSON baseline.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--benchmarks', nargs='+', choices=BENCHMARKS, default=list(BENCHMARKS),
+            help="Benchmarks to run (default: all).")
+        parser.add_argument(
+            '--sizes', nargs='+', type=int, default=[10, 100, 1000],
+            help="Screen counts for templates and row counts for STF files.")
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help="Timed runs per benchmark; the fastest is reported.")
+        parser.add_argument(
+            '--baseline', type=Path, default=DEFAULT_BASELINE,
+            help="JSON baseline file to compare against or save to.")
+        parser.add_argument(
+            '--threshold', type=float, default=0.25,
+            help="Allowed relative growth in wall time and peak memory.")
+        parser.add_argument(
+            '--min-delta-ms', type=float, default=1.0,
+            help="Ignore wall time growth smaller than this many milliseconds.")
+        parser.add_argument(
+            '--retries', type=int, default=3,
+            help="Times to re-measure a benchmark that looks slower than the "
+                 "baseline before reporting it, keeping the best result.")
+        parser.add_argument(
+            '--save-baseline', action='store_true',
+            help="Write the results to the baseline file instead of comparing.")
+
+    def handle(self, *args, **options):
+        runs = {
+            f"{name}[{size}]": (name, size)
+            for name in options['benchmarks'] for size in options['sizes']
+        }
+        results = {}
+        for key, (name, size) in runs.items():
+            results[key] = BENCHMARKS[name](size, options['repeat'])
+            self.stdout.write(f"{key}: {json.dumps(results[key])}")
+
+        baseline_path = options['baseline']
+        if options['save_baseline']:
+            save_baseline(baseline_path, results)
+            self.stdout.write(self.style.SUCCESS(
+                f"Saved baseline to {baseline_path}"))
+            return
+
+        if not baseline_path.exists():
+            raise CommandError(
+                f"No baseline at {baseline_path}, run with --save-baseline first")
+
+        baseline = load_baseline(baseline_path)
+        uncompared = sorted(set(results) - set(baseline))
+        if len(uncompared) == len(results):
+            raise CommandError(
+                f"None of the results are in the baseline at {baseline_path}, "
+                "run with --save-baseline for these benchmarks and sizes")
+        if uncompared:
+            self.stdout.write(self.style.WARNING(
+                "Not in the baseline, skipped: " + ", ".join(uncompared)))
+
+        def regressed(key):
+            return key in baseline and compare_results(
+                {key: baseline[key]}, {key: results[key]},
+                options['threshold'], options['min_delta_ms'])
+
+        # Machine load shifts timings between runs, so confirm a slowdown
+        # by measuring again before reporting it
+        for _ in range(options['retries']):
+            suspects = [key for key in results if regressed(key)]
+            if not suspects:
+                break
+            for key in suspects:
+                name, size = runs[key]
+                results[key] = merge_best(
+                    results[key], BENCHMARKS[name](size, options['repeat']))
+                self.stdout.write(f"{key} (retry): {json.dumps(results[key])}")
+
+        regressions = compare_results(
+            baseline, results, options['threshold'], options['min_delta_ms'])
+        if regressions:
+            raise CommandError(
+                "Performance regressions detected:\n" + "\n".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
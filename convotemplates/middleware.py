@@ -0,0 +1,51 @@
+import re
+
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+re_accepts_brotli = re.compile(r'\bbr\b')
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress large responses with brotli when the client accepts it and the
+    brotli package is installed, otherwise fall back to gzip.
+
+    Enable by adding 'convotemplates.middleware.CompressionMiddleware' near
+    the top of MIDDLEWARE in the project settings.
+    """
+    min_length = 1024
+    brotli_quality = 5
+
+    def process_response(self, request, response):
+        # Small payloads aren't worth the CPU time or the extra headers
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if (brotli is None or response.streaming
+                or response.has_header('Content-Encoding')
+                or not re_accepts_brotli.search(accept_encoding)):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed_content = brotli.compress(
+            response.content, quality=self.brotli_quality)
+        if len(compressed_content) >= len(response.content):
+            return response
+
+        response.content = compressed_content
+        response.headers['Content-Length'] = str(len(compressed_content))
+
+        # The compressed body differs from the original, so a strong ETag
+        # would no longer be valid
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
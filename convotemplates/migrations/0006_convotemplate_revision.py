@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('convotemplates', '0005_remove_convooption_stf_reference_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='convotemplate',
+            name='revision',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
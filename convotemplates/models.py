@@ -4,6 +4,7 @@ from django.db import models
 class ConvoTemplate(models.Model):
     name = models.CharField(max_length=255)
     stf_mode = models.BooleanField(default=False)
+    revision = models.PositiveIntegerField(default=1)
     initial_screen = models.ForeignKey(
         'ConvoScreen', null=True, blank=True, on_delete=models.SET_NULL, related_name='initial_for')
 
@@ -0,0 +1,20 @@
+from ninja.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Render API responses with orjson when it is installed.
+
+    Falls back to the default ninja JSON renderer otherwise, so orjson stays
+    an optional dependency.
+    """
+
+    def render(self, request, data, *, response_status):
+        if orjson is None:
+            return super().render(request, data, response_status=response_status)
+        return orjson.dumps(data, default=self.encoder_class().default)
@@ -1,3 +1,218 @@
-from django.test import TestCase
+import gzip
+import io
+import json
+import tempfile
+from collections import deque
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from benchmarks.harness import compare_results, measure, merge_best
+
+from .middleware import CompressionMiddleware, brotli
+from .models import ConvoOption, ConvoScreen, ConvoTemplate
+from .renderers import ORJSONRenderer, orjson
+
+
+@override_settings(ROOT_URLCONF='convotemplates.urls')
+class TemplateETagTests(TestCase):
+    def setUp(self):
+        self.template = ConvoTemplate.objects.create(name='test')
+        screen = ConvoScreen.objects.create(
+            template=self.template, id_name='start', custom_dialog_text='Hello')
+        ConvoOption.objects.create(screen=screen, text='Bye')
+        self.template.initial_screen = screen
+        self.template.save()
+        self.url = f'/api/templates/{self.template.id}'
+        self.etag = f'W/"{self.template.id}-1"'
+
+    def test_get_sets_weak_etag(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], self.etag)
+        self.assertEqual(response['Cache-Control'], 'no-cache')
+
+    def test_matching_etag_returns_304(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], self.etag)
+
+    def test_strong_form_matches_weakly(self):
+        response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=f'"{self.template.id}-1"')
+        self.assertEqual(response.status_code, 304)
+
+    def test_wildcard_returns_304(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='*')
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_etag_returns_body(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='W/"0-1"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['name'], 'test')
+
+    def test_update_invalidates_etag(self):
+        payload = self.client.get(self.url).json()
+        payload['name'] = 'renamed'
+        response = self.client.put(
+            self.url, json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+
+        self.template.refresh_from_db()
+        self.assertEqual(self.template.revision, 2)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=self.etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['ETag'], f'W/"{self.template.id}-2"')
+        self.assertEqual(response.json()['name'], 'renamed')
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    body = b'{"screens": []}' * 200
+
+    def process(self, accept_encoding, body=body):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        response = HttpResponse(body)
+        response['ETag'] = '"abc"'
+        middleware = CompressionMiddleware(lambda request: response)
+        return middleware.process_response(request, response)
+
+    @skipUnless(brotli, "brotli is not installed")
+    def test_prefers_brotli(self):
+        response = self.process('gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), self.body)
+        self.assertEqual(response['Content-Length'], str(len(response.content)))
+        self.assertEqual(response['ETag'], 'W/"abc"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+    def test_gzip_without_brotli_support(self):
+        response = self.process('gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.body)
+        self.assertEqual(response['ETag'], 'W/"abc"')
+
+    def test_gzip_without_brotli_module(self):
+        with mock.patch('convotemplates.middleware.brotli', None):
+            response = self.process('gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_small_response_untouched(self):
+        response = self.process('gzip, br', body=b'{}')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['ETag'], '"abc"')
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    data = {"name": "test", "screens": [{"id": 1, "options": []}]}
+
+    def render(self):
+        request = RequestFactory().get('/')
+        return ORJSONRenderer().render(request, self.data, response_status=200)
+
+    @skipUnless(orjson, "orjson is not installed")
+    def test_renders_compact_json(self):
+        self.assertEqual(
+            self.render(), b'{"name":"test","screens":[{"id":1,"options":[]}]}')
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch('convotemplates.renderers.orjson', None):
+            output = self.render()
+        self.assertEqual(json.loads(output), self.data)
+
+
+class CompareResultsTests(SimpleTestCase):
+    baseline = {"lua[10]": {"wall_ms": 10.0, "queries": 5, "peak_kib": 100.0}}
+
+    def test_within_threshold(self):
+        results = {"lua[10]": {"wall_ms": 12.0, "queries": 5, "peak_kib": 120.0}}
+        self.assertEqual(compare_results(self.baseline, results, 0.25), [])
+
+    def test_slower_than_threshold(self):
+        results = {"lua[10]": {"wall_ms": 13.0, "queries": 5, "peak_kib": 100.0}}
+        self.assertEqual(compare_results(self.baseline, results, 0.25),
+                         ["lua[10] wall_ms: 10.0 -> 13.0"])
+
+    def test_small_absolute_slowdown_is_ignored(self):
+        baseline = {"stf_read[10]": {"wall_ms": 0.37, "queries": 0, "peak_kib": 10.0}}
+        results = {"stf_read[10]": {"wall_ms": 0.9, "queries": 0, "peak_kib": 10.0}}
+        self.assertEqual(compare_results(baseline, results, 0.25), [])
+
+    def test_any_extra_query_regresses(self):
+        results = {"lua[10]": {"wall_ms": 10.0, "queries": 6, "peak_kib": 100.0}}
+        self.assertEqual(compare_results(self.baseline, results, 0.25),
+                         ["lua[10] queries: 5 -> 6"])
+
+    def test_new_benchmark_is_ignored(self):
+        results = {"lua[100]": {"wall_ms": 99.0, "queries": 50, "peak_kib": 1.0}}
+        self.assertEqual(compare_results(self.baseline, results, 0.25), [])
+
+
+class MergeBestTests(SimpleTestCase):
+    def test_keeps_best_of_each_metric(self):
+        first = {"wall_ms": 12.0, "queries": 5, "peak_kib": 90.0}
+        second = {"wall_ms": 10.0, "queries": 5, "peak_kib": 95.0}
+        self.assertEqual(merge_best(first, second),
+                         {"wall_ms": 10.0, "queries": 5, "peak_kib": 90.0})
+
+
+class MeasureTests(TestCase):
+    def test_counts_queries_beyond_query_log_limit(self):
+        def run_queries():
+            for _ in range(10):
+                ConvoTemplate.objects.exists()
+
+        # Shrink connection.queries, which normally keeps 9000 entries
+        with mock.patch.object(connection, 'queries_limit', 5), \
+                mock.patch.object(connection, 'queries_log', deque(maxlen=5)):
+            for _ in range(2):
+                self.assertEqual(measure(run_queries, repeat=1)["queries"], 10)
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_missing_baseline_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesMessage(CommandError, "No baseline"):
+                call_command(
+                    'benchmark', benchmarks=['stf_write'], sizes=[10], repeat=1,
+                    baseline=Path(tmp) / 'baseline.json', stdout=io.StringIO())
+
+    def test_compares_against_saved_baseline(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            options = {
+                'benchmarks': ['create'], 'sizes': [10], 'repeat': 1,
+                'baseline': Path(tmp) / 'baseline.json', 'stdout': io.StringIO(),
+            }
+            call_command('benchmark', save_baseline=True, **options)
+            baseline = json.loads(options['baseline'].read_text())
+            baseline['create[10]']['queries'] -= 1
+            options['baseline'].write_text(json.dumps(baseline))
+
+            with self.assertRaisesMessage(CommandError, "create[10] queries"):
+                call_command('benchmark', **options)
+
+    def test_no_overlap_with_baseline_fails(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            baseline = Path(tmp) / 'baseline.json'
+            baseline.write_text(json.dumps(
+                {"stf_write[10]": {"wall_ms": 1.0, "queries": 0, "peak_kib": 1.0}}))
+            with self.assertRaisesMessage(CommandError, "None of the results"):
+                call_command(
+                    'benchmark', benchmarks=['stf_write'], sizes=[20], repeat=1,
+                    baseline=baseline, stdout=io.StringIO())
+
+    def test_partial_overlap_warns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            options = {
+                'benchmarks': ['stf_write'], 'repeat': 1,
+                'baseline': Path(tmp) / 'baseline.json', 'stdout': io.StringIO(),
+            }
+            call_command('benchmark', sizes=[10], save_baseline=True, **options)
+            call_command('benchmark', sizes=[10, 20], threshold=100, **options)
+        self.assertIn(
+            "Not in the baseline, skipped: stf_write[20]",
+            options['stdout'].getvalue())
@@ -2,7 +2,7 @@ import re
 import glob
 import os
 import io
-import numpy as np
+import struct
 import json
 import csv
 import json
@@ -21,9 +21,8 @@ class STFReader:
     def read_byte(self, num_bytes):
         buffer = self.buffer.read(num_bytes)
 
-        dt = np.dtype(np.int32)
-        dt = dt.newbyteorder('<')
-        bytes = np.frombuffer(buffer, dtype=dt)
+        # Little-endian int32 values
+        bytes = struct.unpack(f'<{len(buffer) // 4}i', buffer)
         return bytes
 
     def read_stf(self, file_data):
@@ -72,15 +71,15 @@ class STFReader:
         return data_dict
 
 
-reader = STFReader()
+if __name__ == '__main__':
+    reader = STFReader()
 
+    with open(file, 'rb') as file:
+        content = file.read()
+        data = reader.read_stf(content)
+        for k, v in data.items():
+            data[k] = v.replace('\n', '')
 
-with open(file, 'rb') as file:
-    content = file.read()
-    data = reader.read_stf(content)
-    for k, v in data.items():
-        data[k] = v.replace('\n', '')
-
-with open('file.json', 'w') as jfile:
-    json_object = json.dumps(data, indent=4)
-    json.dump(data, jfile, indent=4)
+    with open('file.json', 'w') as jfile:
+        json_object = json.dumps(data, indent=4)
+        json.dump(data, jfile, indent=4)